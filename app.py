@@ -1,38 +1,238 @@
 import yfinance as yf
 import pandas as pd
-import ta
-from ta.trend import ADXIndicator
-from ta.momentum import RSIIndicator, StochasticOscillator
-from datetime import datetime
-import warnings
+import numpy as np
+import asyncio
+import json
+import aiohttp
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import requests
+import lxml.html
+import indicators
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
-import random
-warnings.filterwarnings('ignore')
 
-# 🚨 Day-Before Explosion Signal Scanner with Rate Limiting
-print("🚨 Day-Before Explosion Signal Scanner")
-print("=" * 50)
+# Yahoo chart endpoint used to retry tickers a batch download dropped
+chart_url = "https://query1.finance.yahoo.com/v8/finance/chart/{}?range=2mo&interval=1d"
+chart_headers = {"User-Agent": "Mozilla/5.0"}
+chart_concurrency = 20
 
-# Load S&P 500 tickers with better error handling
-print("🔎 Loading S&P 500 tickers...")
-try:
-    # Try primary source first
-    sp500_url = "https://datahub.io/core/s-and-p-500-companies/r/data.csv"
-    tickers_df = pd.read_csv(sp500_url)
-    tickers = tickers_df["Symbol"].tolist()
-    print(f"✅ Loaded {len(tickers)} tickers from datahub.io")
-except Exception as e:
-    print(f"⚠️ Primary source failed: {e}")
-    print("🔄 Using fallback ticker list...")
+# One keep-alive session for the plain HTTP calls (Wikipedia, Finviz pages);
+# yfinance keeps its own shared session across downloads
+http = requests.Session()
+http.headers.update(chart_headers)
+
+
+async def fetch_chart(session, sem, symbol):
+    """Fetch one symbol's daily bars as raw numpy arrays.
+
+    Returns (symbol, chart, throttled): chart is None on failure, and
+    throttled says the failure was a 429 or a timeout rather than no data.
+    """
+    async with sem:
+        try:
+            async with session.get(chart_url.format(symbol)) as r:
+                if r.status != 200:
+                    return symbol, None, r.status == 429
+                payload = await r.json()
+        except asyncio.TimeoutError:
+            return symbol, None, True
+        except (aiohttp.ClientError, ValueError):
+            return symbol, None, False
+    # A malformed payload only loses this symbol, never the whole batch
+    try:
+        result = payload["chart"]["result"][0]
+        quote = result["indicators"]["quote"][0]
+        timestamp = np.asarray(result["timestamp"], dtype="datetime64[s]")
+        chart = {col: np.asarray(quote[col.lower()], dtype=np.float64)
+                 for col in ("Open", "High", "Low", "Close", "Volume")}
+    except (KeyError, IndexError, TypeError, ValueError):
+        return symbol, None, False
+    if timestamp.ndim != 1 or any(values.shape != timestamp.shape for values in chart.values()):
+        return symbol, None, False
+    chart["timestamp"] = timestamp
+    return symbol, chart, False
+
+
+async def fetch_charts(symbols):
+    """Fetch many symbols concurrently, at most chart_concurrency in flight.
+
+    Returns ({symbol: chart}, throttled_symbols); failed symbols are left out
+    of the dict.
+    """
+    sem = asyncio.Semaphore(chart_concurrency)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(headers=chart_headers, timeout=timeout) as session:
+        fetched = await asyncio.gather(*(fetch_chart(session, sem, s) for s in symbols))
+    charts = {symbol: chart for symbol, chart, _ in fetched if chart is not None}
+    return charts, {symbol for symbol, _, throttled in fetched if throttled}
+
+
+def chart_to_frame(chart):
+    """Build the OHLCV DataFrame for a fetched chart, dropping empty bars."""
+    index = pd.DatetimeIndex(chart.pop("timestamp")).normalize()
+    return pd.DataFrame(chart, index=index).dropna()
+
+
+class AIMDLimiter:
+    """Adaptive request rate (symbols per second) for everything that talks to Yahoo.
+
+    The rate creeps up by `step` after every fast response and is cut to 80%
+    whenever Yahoo throttles us, so scans run close to the real limit
+    instead of behind fixed sleeps. Shared by every thread that talks to Yahoo.
+    """
+
+    def __init__(self, rate, min_rate, max_rate, step, target_latency):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.target_latency = target_latency
+        self.last = time.monotonic()
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def wait(self, n=1):
+        """Sleep until n more symbols may be requested at the current rate."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.last)
+            self.last = start + n / self.rate
+            need = start - now
+        if need > 0:
+            time.sleep(need)
+
+    def ok(self, latency):
+        """Additive increase after a request that came back quickly."""
+        if latency < self.target_latency:
+            with self.lock:
+                self.rate = min(self.max_rate, self.rate + self.step)
+
+    def hit(self):
+        """Multiplicative decrease after a 429 or timeout, never below min_rate."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * 0.8)
+            self.hits += 1
+
+
+def load_cache():
+    """Read every cached ticker's bars in one go; returns {ticker: ohlcv_df}."""
+    if not cache_path.exists():
+        return {}
+    bars = pd.read_parquet(cache_path)
+    return {ticker: df.drop(columns="Ticker").set_index("Date")
+            for ticker, df in bars.groupby("Ticker", sort=False)}
+
+
+def save_cache(cache):
+    """Write every ticker's bars to one long-format parquet (Ticker, Date, OHLCV)."""
+    if not cache:
+        return
+    bars = pd.concat(cache, names=["Ticker", "Date"]).reset_index()
+    cutoff = pd.Timestamp.today().normalize() - pd.DateOffset(months=2)
+    bars = bars[bars["Date"] >= cutoff]
+    # Quotes carry a handful of significant digits, so prices fit float32 and
+    # the file halves; volume stays float64 to keep share counts exact.
+    # The scoring panel is float64 either way.
+    price_columns = ["Open", "High", "Low", "Close"]
+    bars = bars.astype(dict.fromkeys(price_columns, np.float32))
+    bars.to_parquet(cache_path, index=False)
+
+
+def trim_window(df):
+    """Keep the same 2-month window a fresh period="2mo" download returns."""
+    cutoff = pd.Timestamp.today().normalize() - pd.DateOffset(months=2)
+    return df[df.index >= cutoff]
+
+
+def last_weekday_at(hour, minute):
+    """Most recent weekday hour:minute New York time (exchange holidays are not skipped)."""
+    now = datetime.now(market_tz)
+    moment = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if moment > now:
+        moment -= timedelta(days=1)
+    while moment.weekday() >= 5:
+        moment -= timedelta(days=1)
+    return moment
+
+
+def cache_is_current():
+    """True if no session has opened or closed since the cache was refreshed.
+
+    A refresh before the open must not serve a run during the session: the
+    new day's bar shifts which bar counts as yesterday's.
+    """
+    if not (cache_path.exists() and cache_stamp.exists()):
+        return False
+    boundary = max(last_weekday_at(9, 30), last_weekday_at(16, 0))
+    try:
+        return datetime.fromisoformat(cache_stamp.read_text().strip()) >= boundary
+    except (ValueError, TypeError):  # empty, truncated or hand-edited stamp
+        return False
+
+
+def load_bad_tickers():
+    """Tickers Yahoo recently returned no data for, as {ticker: "YYYY-MM-DD"}.
+
+    Entries expire after bad_ticker_days so a renamed or relisted symbol, or
+    one caught by a bad day at Yahoo, gets retried eventually.
+    """
+    if not bad_tickers_path.exists():
+        return {}
+    cutoff = (datetime.now() - timedelta(days=bad_ticker_days)).strftime("%Y-%m-%d")
+    return {t: day for t, day in json.loads(bad_tickers_path.read_text()).items() if day >= cutoff}
+
+
+def fetch_tickers():
+    """Download the S&P 500 symbol list; None if every source failed."""
+    try:
+        # Try primary source first
+        sp500_url = "https://datahub.io/core/s-and-p-500-companies/r/data.csv"
+        tickers_df = pd.read_csv(sp500_url)
+        tickers = tickers_df["Symbol"].tolist()
+        print(f"✅ Loaded {len(tickers)} tickers from datahub.io")
+        return tickers
+    except Exception as e:
+        print(f"⚠️ Primary source failed: {e}")
+        print("🔄 Using fallback ticker list...")
     # Fallback to Wikipedia source
     try:
         sp500_url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        sp500_table = pd.read_html(sp500_url)[0]
-        tickers = sp500_table['Symbol'].tolist()
+        # Only the constituents table is needed, so read its first column
+        # directly instead of letting pd.read_html parse every table on the page
+        r = http.get(sp500_url, timeout=10)
+        r.raise_for_status()
+        rows = lxml.html.fromstring(r.content).xpath(
+            "(//table[contains(@class, 'wikitable')])[1]//tr[td]")
+        tickers = ["".join(row.xpath("td[1]//text()")).strip() for row in rows]
+        if not tickers:
+            raise ValueError("no constituents table on the page")
         tickers = [t.replace('.', '-') for t in tickers]  # Clean for yfinance
         print(f"✅ Loaded {len(tickers)} tickers from Wikipedia")
+        return tickers
     except Exception as e2:
         print(f"⚠️ Fallback also failed: {e2}")
+        return None
+
+
+def load_tickers():
+    """S&P 500 symbols, from the on-disk copy while it is younger than tickers_ttl."""
+    if tickers_path.exists() and time.time() - tickers_path.stat().st_mtime < tickers_ttl:
+        tickers = json.loads(tickers_path.read_text())
+        print(f"✅ Loaded {len(tickers)} tickers from {tickers_path}")
+        return tickers
+    tickers = fetch_tickers()
+    if tickers is None and tickers_path.exists():
+        # An outdated list is still far closer to the index than the sample below
+        tickers = json.loads(tickers_path.read_text())
+        print(f"🔄 Using the last saved list of {len(tickers)} tickers from {tickers_path}")
+        return tickers
+    if tickers is None:
         print("🔄 Using sample ticker list...")
         # Ultimate fallback - sample of major S&P 500 stocks
         tickers = [
@@ -40,10 +240,248 @@ except Exception as e:
             'ADBE', 'CRM', 'PYPL', 'INTC', 'AMD', 'QCOM', 'TXN', 'AVGO',
             'ORCL', 'IBM', 'NOW', 'INTU', 'MU', 'AMAT', 'ADI', 'LRCX',
             'KLAC', 'MCHP', 'SNPS', 'CDNS', 'FTNT', 'PANW', 'CRWD', 'ZS',
-            'DDOG', 'NET', 'SNOW', 'PLTR', 'COIN', 'SQ', 'SHOP', 'ROKU',
-            'ZM', 'DOCU', 'OKTA', 'TWLO', 'SPLK', 'WORK', 'DBX', 'BOX'
+            'DDOG', 'NET', 'SNOW', 'PLTR', 'COIN', 'XYZ', 'SHOP', 'ROKU',
+            'ZM', 'DOCU', 'OKTA', 'TWLO', 'DBX', 'BOX'
         ]
         print(f"✅ Using {len(tickers)} sample tickers")
+        return tickers  # not cached, so the next run tries the real list again
+    tickers_path.write_text(json.dumps(tickers))
+    return tickers
+
+
+def fetch_screener_candidates():
+    """S&P 500 symbols Finviz lists inside the loose price band; None if unavailable."""
+    candidates = set()
+    try:
+        # Finviz shows 20 rows per page; r= is the 1-based first row
+        for first_row in range(1, 600, 20):
+            if first_row > 1:
+                time.sleep(screener_page_delay)
+            r = http.get(f"{screener_url}&r={first_row}", timeout=10)
+            r.raise_for_status()
+            # Every cell in a result row links to the quote page, so take the
+            # symbol from the t= parameter of each row's first link
+            rows = lxml.html.fromstring(r.content).xpath(
+                "//table//tr[.//a[starts-with(@href, 'quote.ashx?t=')]]")
+            for row in rows:
+                href = row.xpath(".//a[starts-with(@href, 'quote.ashx?t=')]/@href")[0]
+                candidates.update(parse_qs(urlparse(href).query).get("t", []))
+            if len(rows) < 20:
+                break
+    except Exception as e:
+        print(f"⚠️ Screener prefilter failed: {e}")
+        return None
+    return candidates or None
+
+
+def fetch_batch(symbols, **window):
+    """Batch-download symbols; returns {ticker: ohlcv_df} for those Yahoo returned."""
+    limiter.wait(len(symbols))
+    started = time.monotonic()
+    data = yf.download(symbols, interval="1d", group_by='ticker', threads=True,
+                       auto_adjust=False, progress=False, timeout=10, **window)
+    latency = time.monotonic() - started
+    # One multi-symbol frame; each ticker's bars are sliced out of it in
+    # request order, so no further HTTP and a stable result order
+    frames = {}
+    if not data.empty:
+        returned = set(data.columns.unique(level=0))
+        for ticker in symbols:
+            if ticker in returned:
+                df = data[ticker][ohlcv_columns].dropna()
+                if not df.empty:
+                    frames[ticker] = df
+
+    # yfinance swallows per-symbol 429s and hands back empty frames, so a
+    # batch that comes back mostly empty is treated as throttling; only a
+    # complete batch may raise the rate
+    if len(frames) < len(symbols) * batch_hit_ratio:
+        limiter.hit()
+    elif len(frames) == len(symbols):
+        limiter.ok(latency)
+    return frames
+
+
+def is_rate_limit(error):
+    """True if a yfinance error means Yahoo is throttling us."""
+    # yfinance >= 0.2.54 raises YFRateLimitError; older releases surface the raw HTTP 429
+    return "RateLimitError" in type(error).__name__ or "Too Many Requests" in str(error)
+
+
+def download_chunk(chunk):
+    """Download one batch of tickers; returns ({ticker: df}, failed_tickers)."""
+    cached = {ticker: ohlcv_cache[ticker] for ticker in chunk if ticker in ohlcv_cache}
+
+    # Once a refresh has run since the last session open or close, cached
+    # tickers that reached the newest bar are served straight from disk. The
+    # stamp says nothing about tickers that run skipped or missed (expired bad
+    # tickers, symbols new to the list or the screener), so anything behind
+    # or uncached still goes through the refresh below
+    served = {t: df for t, df in cached.items() if df.index[-1] == cache_newest_bar} if cache_is_current() else {}
+
+    # Cached tickers refetch from the bar before their last one (the last
+    # may have been a partial intraday bar); grouped so each distinct start
+    # is one batch. That completed bar is fetched again to check the cache
+    uncached = [t for t in chunk if t not in cached]
+    by_check_bar = {}
+    for ticker, df in cached.items():
+        if ticker in served:
+            continue
+        if len(df) < 2:
+            uncached.append(ticker)
+        else:
+            by_check_bar.setdefault(df.index[-2], []).append(ticker)
+
+    frames = {}
+    throttled = set()
+    try:
+        for check_bar, group in by_check_bar.items():
+            for ticker, df in fetch_batch(group, start=check_bar.strftime("%Y-%m-%d")).items():
+                old = cached[ticker]
+                # Yahoo back-adjusts history after a split, so if the
+                # overlapping bar no longer matches, the cached bars are on
+                # the old price scale (rtol allows for float32 storage)
+                if check_bar not in df.index or not np.isclose(
+                        df.at[check_bar, "Close"], old.at[check_bar, "Close"], rtol=1e-5):
+                    uncached.append(ticker)
+                    continue
+                frames[ticker] = pd.concat([old[old.index < check_bar], df])
+        if uncached:
+            # Download 2 months of daily data for the whole batch; yfinance
+            # splits it into multi-symbol requests and fetches them in parallel
+            frames.update(fetch_batch(uncached, period="2mo"))
+    except Exception as e:
+        if is_rate_limit(e):
+            print(f"⚠️ Rate limit hit on batch starting at {chunk[0]}, slowing down...")
+            limiter.hit()
+            throttled.update(t for t in chunk if t not in frames and t not in served)
+        else:
+            print(f"⚠️ Batch download failed at {chunk[0]} ({type(e).__name__}: {e}), retrying per symbol...")
+
+    # Tickers the batch dropped get one retry, concurrently against the chart
+    # endpoint; after a rate limit this runs at the reduced rate. yfinance
+    # swallows its own 429s, so this retry is where throttling shows up
+    missing = [t for t in chunk if t not in frames and t not in served]
+    if missing:
+        limiter.wait(len(missing))
+        charts, chart_throttled = asyncio.run(fetch_charts(missing))
+        for ticker, chart in charts.items():
+            frames[ticker] = chart_to_frame(chart)
+        if chart_throttled:
+            print(f"⚠️ Chart retries throttled on batch starting at {chunk[0]}, slowing down...")
+            limiter.hit()
+            throttled |= chart_throttled
+    throttled -= frames.keys()
+    if throttled:
+        rate_limited_batches.append(chunk[0])
+    download_counts.append((len(chunk) - len(served), len(frames)))
+
+    for ticker, df in frames.items():
+        frames[ticker] = ohlcv_cache[ticker] = trim_window(df)
+
+    missing = [t for t in chunk if t not in frames and t not in served and t not in throttled]
+    results = {t: frames.get(t, served.get(t)) for t in chunk if t in frames or t in served}
+    # Misses are only candidates for bad_tickers until the run is over and
+    # shows Yahoo was answering; throttled symbols had no real answer at all
+    run_misses.extend(missing)
+    failed = [f"{ticker} (rate limited)" for ticker in chunk if ticker in throttled]
+    return results, failed + [f"{ticker} (delisted/missing)" for ticker in missing]
+
+
+def scan_chunk(frames):
+    """Score a batch of tickers together; returns (hits_df, failed_tickers).
+
+    The batch is stacked into (n_tickers, n_bars) arrays so each indicator
+    runs once per batch instead of once per ticker. hits_df holds the
+    unrounded result columns for every explosion setup.
+    """
+    failed = []
+    scored = []
+    for ticker, df in frames.items():
+        if len(df) < 20:  # Need enough data for indicators
+            failed.append(f"{ticker} (insufficient data)")
+            continue
+        scored.append(ticker)
+    if not scored:
+        return pd.DataFrame(), failed
+
+    # One left-aligned panel for the whole batch; each row is scored at its
+    # own second-to-last bar, so tickers with gaps need no special casing
+    lengths = np.array([len(frames[t]) for t in scored])
+    bars = lengths - 2
+    # Only the columns the indicators read, copied out of each frame in one go
+    panel = np.full((len(panel_columns), len(scored), lengths.max()), np.nan)
+    for j, ticker in enumerate(scored):
+        panel[:, j, :lengths[j]] = frames[ticker][panel_columns].to_numpy(dtype=np.float64).T
+    high, low, close, volume = panel
+
+    # Price and volume gates are cheap and reject almost every ticker, so
+    # check them first and only compute indicators for the survivors
+    yesterday = np.arange(len(scored)), bars
+    price, vol = close[yesterday], volume[yesterday]
+    vol10 = indicators.mean_at(volume, bars, 10)
+    keep = np.flatnonzero(
+        (min_price <= price) & (price <= max_price) & (vol > min_volume) & (vol > 2 * vol10)
+    )
+    if not len(keep):
+        return pd.DataFrame(), failed
+    scored = [scored[j] for j in keep]
+    high, low, close, bars = high[keep], low[keep], close[keep], bars[keep]
+
+    # Calculate technical indicators (IDENTICAL to Streamlit), only for
+    # yesterday's bar - that is the one row the criteria read
+    signals = indicators.signals_at(high, low, close, bars)
+    rows = np.column_stack([price[keep], vol[keep]] + [signals[name] for name in signal_columns] + [vol10[keep]])
+
+    # Check if indicators are valid (not NaN)
+    invalid = np.isnan(rows).any(axis=1)
+    failed.extend(f"{ticker} (invalid indicators)" for ticker in np.array(scored)[invalid])
+
+    # IDENTICAL explosion criteria - Match specs seen in ABVX day prior,
+    # evaluated for the whole batch at once
+    c, v, adx, pdi, mdi, rsi, k, d, v10 = rows.T
+    is_hit = ~invalid & (
+        (min_price <= c) & (c <= max_price) &
+        (v > min_volume) &
+        (adx >= min_adx) &
+        ((pdi - mdi) >= 10) &
+        (60 <= rsi) & (rsi <= 75) &
+        (k > 70) &
+        (k > d) &
+        (v > 2 * v10)
+    )
+
+    c, v, adx, pdi, mdi, rsi, k, d, v10 = rows[is_hit].T
+    return pd.DataFrame({
+        "Ticker": np.array(scored)[is_hit],
+        "Price": c,
+        "ADX": adx,
+        "+DI": pdi,
+        "-DI": mdi,
+        "DI_Diff": pdi - mdi,
+        "RSI": rsi,
+        "%K": k,
+        "%D": d,
+        "Volume": v,
+        "Vol10Avg": v10,
+        "Vol_Ratio": v / v10,
+    }), failed
+
+
+# 🚨 Day-Before Explosion Signal Scanner with Rate Limiting
+print("🚨 Day-Before Explosion Signal Scanner")
+print("=" * 50)
+
+# On-disk cache: the ticker list, plus every ticker's OHLCV bars in one
+# parquet refreshed at most once per session open and close
+cache_dir = Path("cache")
+cache_dir.mkdir(exist_ok=True)
+tickers_path = cache_dir / "tickers.json"
+tickers_ttl = 7 * 24 * 3600  # index membership changes quarterly at most
+
+# Load S&P 500 tickers with better error handling
+print("🔎 Loading S&P 500 tickers...")
+tickers = load_tickers()
 
 # IDENTICAL Scanner thresholds from your Streamlit app
 min_price = 3
@@ -51,6 +489,57 @@ max_price = 15
 min_volume = 500000
 min_adx = 40
 
+# Optional screener prefilter: one Finviz query drops index members far
+# outside the price band before anything is downloaded. Off by default:
+# Finviz filters on today's price, so a name that closed in range yesterday
+# and ran past the band today - the explosion this scanner looks for - is
+# dropped. Safe to enable before the open, when today's price is still
+# yesterday's close. Volume is left to the scan since a spike can come off a
+# thin average.
+prefilter = False
+screener_url = "https://finviz.com/screener.ashx?v=111&f=idx_sp500,sh_price_o2,sh_price_u20"
+screener_page_delay = 0.5  # seconds between result pages
+
+# Batch size for multi-symbol yfinance requests
+chunk_size = 150
+
+cache_path = cache_dir / "ohlcv.parquet"
+cache_stamp = cache_dir / "last_refresh.txt"
+market_tz = ZoneInfo("America/New_York")
+bad_tickers_path = cache_dir / "bad_tickers.json"
+bad_ticker_days = 7
+max_miss_ratio = 0.1  # a run missing more than this looks like an outage
+ohlcv_columns = ["Open", "High", "Low", "Close", "Volume"]
+panel_columns = ["High", "Low", "Close", "Volume"]
+signal_columns = ["ADX", "+DI", "-DI", "RSI", "%K", "%D"]
+
+# Global request rate in symbols per second; starts conservative and adapts
+limiter = AIMDLimiter(rate=50, min_rate=10, max_rate=500, step=10, target_latency=5)
+batch_hit_ratio = 0.5  # a batch returning fewer symbols than this counts as throttled
+
+# The whole OHLCV cache is read once; batches read from and update this dict
+ohlcv_cache = load_cache()
+cache_newest_bar = max((df.index[-1] for df in ohlcv_cache.values()), default=None)
+
+# Each ticker is scanned once, and symbols Yahoo recently had no data for are skipped
+tickers = list(dict.fromkeys(t.replace('.', '-') for t in tickers))
+bad_tickers = load_bad_tickers()
+rate_limited_batches = []
+download_counts = []  # (requested, downloaded) for each batch
+run_misses = []  # symbols Yahoo returned nothing for this run
+known_bad = [t for t in tickers if t in bad_tickers]
+if known_bad:
+    tickers = [t for t in tickers if t not in bad_tickers]
+    print(f"⏭️ Skipping {len(known_bad)} tickers with no data in the last {bad_ticker_days} days")
+
+if prefilter:
+    candidates = fetch_screener_candidates()
+    if candidates is not None:
+        tickers = [t for t in tickers if t in candidates]
+        print(f"🧮 Screener prefilter kept {len(tickers)} tickers in the price band")
+    else:
+        print("🔄 Scanning the full ticker list instead...")
+
 print(f"📈 Scanning {len(tickers)} tickers with explosion criteria...")
 print("🎯 Criteria:")
 print(f"   • Price: ${min_price} - ${max_price}")
@@ -64,109 +553,70 @@ print()
 
 scan_results = []
 failed_tickers = []
-rate_limit_delays = 0
 
-for i, ticker in enumerate(tickers):
-    try:
-        # Show progress every 50 tickers
-        if i % 50 == 0:
-            print(f"Progress: {i}/{len(tickers)} ({i/len(tickers)*100:.1f}%) | Found: {len(scan_results)} | Failed: {len(failed_tickers)}")
-        
-        # Rate limiting to avoid Yahoo Finance limits
-        if i > 0 and i % 20 == 0:  # Pause every 20 requests
-            delay = random.uniform(1, 3)  # Random delay 1-3 seconds
-            time.sleep(delay)
-            rate_limit_delays += 1
-        
-        # Additional delay for every request to be safer
-        time.sleep(random.uniform(0.1, 0.5))
-        
-        # Download 2 months of daily data with timeout
-        df = yf.download(ticker, period="2mo", interval="1d", progress=False, timeout=10)
-        
-        if df.empty or len(df) < 20:  # Need enough data for indicators
-            failed_tickers.append(f"{ticker} (insufficient data)")
-            continue
-        
-        # Calculate technical indicators (IDENTICAL to Streamlit)
-        df["RSI"] = RSIIndicator(df["Close"]).rsi()
-        
-        adx = ADXIndicator(df["High"], df["Low"], df["Close"])
-        df["ADX"] = adx.adx()
-        df["+DI"] = adx.plus_di()
-        df["-DI"] = adx.minus_di()
-        
-        stoch = StochasticOscillator(df["High"], df["Low"], df["Close"])
-        df["%K"] = stoch.stoch()
-        df["%D"] = stoch.stoch_signal()
-        
-        df["Vol10Avg"] = df["Volume"].rolling(window=10).mean()
-        
-        # Get yesterday's data (IDENTICAL logic)
-        yesterday = df.iloc[-2]
-        
-        # Check if indicators are valid (not NaN)
-        required_indicators = ['Close', 'Volume', 'ADX', '+DI', '-DI', 'RSI', '%K', '%D', 'Vol10Avg']
-        if any(pd.isna(yesterday[indicator]) for indicator in required_indicators):
-            failed_tickers.append(f"{ticker} (invalid indicators)")
-            continue
-        
-        # IDENTICAL explosion criteria - Match specs seen in ABVX day prior
-        if (
-            min_price <= yesterday["Close"] <= max_price and
-            yesterday["Volume"] > min_volume and
-            yesterday["ADX"] >= min_adx and
-            (yesterday["+DI"] - yesterday["-DI"]) >= 10 and
-            60 <= yesterday["RSI"] <= 75 and
-            yesterday["%K"] > 70 and
-            yesterday["%K"] > yesterday["%D"] and
-            yesterday["Volume"] > 2 * yesterday["Vol10Avg"]
-        ):
-            scan_results.append({
-                "Ticker": ticker,
-                "Price": round(yesterday["Close"], 2),
-                "ADX": round(yesterday["ADX"], 2),
-                "+DI": round(yesterday["+DI"], 2),
-                "-DI": round(yesterday["-DI"], 2),
-                "DI_Diff": round(yesterday["+DI"] - yesterday["-DI"], 2),
-                "RSI": round(yesterday["RSI"], 2),
-                "%K": round(yesterday["%K"], 2),
-                "%D": round(yesterday["%D"], 2),
-                "Volume": int(yesterday["Volume"]),
-                "Vol10Avg": int(yesterday["Vol10Avg"]),
-                "Vol_Ratio": round(yesterday["Volume"] / yesterday["Vol10Avg"], 2),
-            })
-            print(f"🚨 EXPLOSION SETUP FOUND: {ticker} @ ${yesterday['Close']:.2f}")
-    
-    except Exception as e:
-        error_type = type(e).__name__
-        if "RateLimitError" in error_type or "Too Many Requests" in str(e):
-            print(f"⚠️ Rate limit hit at {ticker}, sleeping longer...")
-            time.sleep(random.uniform(5, 10))  # Longer sleep for rate limits
-            rate_limit_delays += 1
-            failed_tickers.append(f"{ticker} (rate limited)")
-        elif "PricesMissingError" in error_type or "delisted" in str(e):
-            failed_tickers.append(f"{ticker} (delisted/missing)")
-        else:
-            failed_tickers.append(f"{ticker} ({error_type})")
-        continue
+chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+# A single download worker fetches the next batch while this thread scores
+# the previous one. Downloads stay one at a time: older yfinance releases keep
+# per-download state in module globals, so concurrent calls clobber each other.
+with ThreadPoolExecutor(max_workers=1) as pool:
+    downloads = pool.map(download_chunk, chunks)
+
+    # Compiling the numba kernels takes a few seconds on a cold cache; do it
+    # here while the first batch is still downloading
+    indicators.warm_up()
+
+    for chunk_no, (frames, failed) in enumerate(downloads):
+        print(f"Progress: {chunk_no * chunk_size}/{len(tickers)} ({chunk_no * chunk_size/len(tickers)*100:.1f}%) | Found: {sum(len(hits) for hits in scan_results)} | Failed: {len(failed_tickers)}")
+        failed_tickers.extend(failed)
+
+        hits, failed = scan_chunk(frames)
+        failed_tickers.extend(failed)
+        if not hits.empty:
+            scan_results.append(hits)
+            for ticker, price in zip(hits["Ticker"], hits["Price"]):
+                print(f"🚨 EXPLOSION SETUP FOUND: {ticker} @ ${price:.2f}")
+
+rate_limit_delays = limiter.hits
+save_cache(ohlcv_cache)
+# Outages are judged once for the whole run, not per batch: a small batch of
+# dead symbols is still a healthy run
+requested = sum(n for n, _ in download_counts)
+downloaded = sum(got for _, got in download_counts)
+yahoo_answered = requested - downloaded <= max_miss_ratio * requested
+if yahoo_answered:
+    today = datetime.now().strftime("%Y-%m-%d")
+    bad_tickers.update((ticker, today) for ticker in run_misses)
+# Only a refresh that worked is stamped: a throttled run or one that looks
+# like an outage leaves the cache stale, so the next run downloads again
+# instead of serving old bars
+if yahoo_answered and not rate_limited_batches:
+    # Written aside and renamed, so an interrupted run never leaves a torn stamp
+    stamp_tmp = cache_stamp.with_suffix(".tmp")
+    stamp_tmp.write_text(datetime.now(timezone.utc).isoformat())
+    stamp_tmp.replace(cache_stamp)
+else:
+    print(f"⚠️ Refresh incomplete ({downloaded}/{requested} tickers downloaded); the next run will download again")
+bad_tickers_path.write_text(json.dumps(bad_tickers, indent=2, sort_keys=True))
 
 print(f"\n🔍 Scan complete!")
 
 # Display results (identical format to Streamlit)
 if scan_results:
-    print(f"✅ Found {len(scan_results)} potential explosion setups.")
+    # Create DataFrame identical to Streamlit display
+    results_df = pd.concat(scan_results, ignore_index=True).round(2)
+    results_df = results_df.astype({"Volume": int, "Vol10Avg": int})
+
+    print(f"✅ Found {len(results_df)} potential explosion setups.")
     print("\n📊 EXPLOSION CANDIDATES:")
     print("=" * 120)
-    
-    # Create DataFrame identical to Streamlit display
-    results_df = pd.DataFrame(scan_results)
     print(results_df.to_string(index=False))
     
     # Save results with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     filename = f"explosion_signals_{timestamp}.csv"
-    results_df.to_csv(filename, index=False)
+    # pyarrow's C++ writer; pandas' to_csv encodes row by row in Python
+    pa_csv.write_csv(pa.Table.from_pandas(results_df, preserve_index=False), filename)
     print(f"\n📁 Results saved to '{filename}'")
     
     # Summary statistics
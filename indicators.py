@@ -0,0 +1,157 @@
+"""Batched technical indicators for the explosion scanner.
+
+Every function takes a panel of 2D float arrays shaped (n_tickers, n_bars),
+one ticker per row, plus `bars`: for each row, the index of the bar to
+evaluate. Rows may hold series of different lengths (left-aligned, padded
+at the end); only bars up to each row's target bar are read. The recursive
+smoothing runs in one pass per ticker, carrying only the running state, so
+no full indicator series is ever built.
+Values match the `ta` library (ADXIndicator, RSIIndicator,
+StochasticOscillator) at that bar; bars still inside the warm-up are NaN.
+
+With numba installed the kernels are compiled and tickers are spread across
+CPU cores; without it they run as plain Python loops.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, parallel=True)
+def adx_at(high, low, close, bars, n=14):
+    """ADX, +DI and -DI at each row's bar.
+
+    True range and directional movement are seeded with their sum over bars
+    1..n and then Wilder-smoothed; ADX is seeded with the mean of the first n
+    DX values and Wilder-smoothed after that.
+    """
+    rows = close.shape[0]
+    adx_out = np.full(rows, np.nan)
+    pdi_out = np.full(rows, np.nan)
+    mdi_out = np.full(rows, np.nan)
+
+    for j in prange(rows):
+        atr = plus_dm = minus_dm = adx = pdi = mdi = 0.0
+        for i in range(1, bars[j] + 1):
+            prev_close = close[j, i - 1]
+            tr = max(high[j, i], prev_close) - min(low[j, i], prev_close)
+            up = high[j, i] - high[j, i - 1]
+            down = low[j, i - 1] - low[j, i]
+            pdm = up if up > down and up > 0 else 0.0
+            mdm = down if down > up and down > 0 else 0.0
+
+            if i <= n:
+                atr += tr
+                plus_dm += pdm
+                minus_dm += mdm
+            else:
+                atr = atr - atr / n + tr
+                plus_dm = plus_dm - plus_dm / n + pdm
+                minus_dm = minus_dm - minus_dm / n + mdm
+            if i < n:
+                continue
+
+            pdi = 100 * plus_dm / atr if atr != 0 else 0.0
+            mdi = 100 * minus_dm / atr if atr != 0 else 0.0
+            dx = 100 * abs(pdi - mdi) / (pdi + mdi) if pdi + mdi != 0 else 0.0
+            if i < 2 * n:
+                adx += dx / n
+            else:
+                adx = (adx * (n - 1) + dx) / n
+
+        if bars[j] >= n:
+            pdi_out[j] = pdi
+            mdi_out[j] = mdi
+        if bars[j] >= 2 * n - 1:
+            adx_out[j] = adx
+    return adx_out, pdi_out, mdi_out
+
+
+@njit(cache=True, parallel=True)
+def rsi_at(close, bars, n=14):
+    """RSI at each row's bar, using Wilder (alpha = 1/n) averages of gains and losses."""
+    rows = close.shape[0]
+    alpha = 1 / n
+    out = np.full(rows, np.nan)
+    for j in prange(rows):
+        avg_gain = avg_loss = 0.0
+        for i in range(1, bars[j] + 1):
+            diff = close[j, i] - close[j, i - 1]
+            avg_gain = (1 - alpha) * avg_gain + alpha * max(diff, 0.0)
+            avg_loss = (1 - alpha) * avg_loss + alpha * max(-diff, 0.0)
+        if bars[j] >= n - 1:
+            out[j] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def stochastic_at(high, low, close, bars, n=14, smooth=3):
+    """Stochastic %K and %D (the mean of the last `smooth` %K values) at each row's bar."""
+    rows = close.shape[0]
+    k_out = np.full(rows, np.nan)
+    d_out = np.full(rows, np.nan)
+    for j in prange(rows):
+        bar = bars[j]
+        k = k_sum = 0.0
+        for b in range(bar - smooth + 1, bar + 1):
+            if b < n - 1:
+                continue
+            lowest = low[j, b - n + 1:b + 1].min()
+            highest = high[j, b - n + 1:b + 1].max()
+            span = highest - lowest
+            if span != 0:
+                k = 100 * (close[j, b] - lowest) / span
+            else:
+                k = np.nan  # flat range: %K is undefined, as in ta
+            k_sum += k
+        if bar >= n - 1:
+            k_out[j] = k
+        if bar >= n + smooth - 2:
+            d_out[j] = k_sum / smooth
+    return k_out, d_out
+
+
+@njit(cache=True, parallel=True)
+def mean_at(values, bars, n):
+    """Simple moving average of the n bars ending at each row's bar."""
+    rows = values.shape[0]
+    out = np.full(rows, np.nan)
+    for j in prange(rows):
+        if bars[j] >= n - 1:
+            out[j] = values[j, bars[j] - n + 1:bars[j] + 1].mean()
+    return out
+
+
+def signals_at(high, low, close, bars):
+    """The trend and momentum indicators at each row's bar.
+
+    The volume average is left to the caller, which needs it earlier to
+    gate tickers before these run.
+    """
+    adx, pdi, mdi = adx_at(high, low, close, bars)
+    k, d = stochastic_at(high, low, close, bars)
+    return {
+        "ADX": adx,
+        "+DI": pdi,
+        "-DI": mdi,
+        "RSI": rsi_at(close, bars),
+        "%K": k,
+        "%D": d,
+    }
+
+
+def warm_up():
+    """Compile (or load from numba's cache) every kernel on a tiny panel."""
+    values = np.ones((1, 30))
+    bars = np.array([28])
+    mean_at(values, bars, 10)
+    signals_at(values, values, values, bars)